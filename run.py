@@ -9,6 +9,11 @@ import sys
 import argparse
 from datetime import datetime, timedelta
 import subprocess
+from functools import cache
+from importlib.util import find_spec
+
+# NFLTransactionAutomation shared by the run_* helpers, created on first use
+_automation = None
 
 def print_banner():
     """Print application banner"""
@@ -17,22 +22,52 @@ def print_banner():
     print("🏈" + "=" * 58 + "🏈")
     print()
 
+def add_src_to_path():
+    """Make the src/ modules importable (once per process)"""
+    if 'src' not in sys.path:
+        sys.path.insert(0, 'src')
+
+def get_automation(cache_max_age=0):
+    """
+    Get the shared automation instance, creating it on first use
+    
+    Args:
+        cache_max_age: Seconds a cached page fetch may be reused (0 fetches live)
+    """
+    global _automation
+    
+    if _automation is None:
+        add_src_to_path()
+        from main import NFLTransactionAutomation
+        
+        _automation = NFLTransactionAutomation(cache_max_age=cache_max_age)
+    else:
+        _automation.scraper.cache_max_age = cache_max_age
+    
+    return _automation
+
+@cache
 def check_dependencies():
-    """Check if required dependencies are installed"""
+    """Check if required dependencies are installed (once per process)"""
     print("📦 Checking dependencies...")
     
-    required_packages = [
-        'requests', 'pandas', 'gspread', 'google-auth', 
-        'python-dotenv', 'retry'
-    ]
+    # pip package name -> importable module name
+    required_packages = {
+        'requests': 'requests',
+        'pandas': 'pandas',
+        'beautifulsoup4': 'bs4',
+        'gspread': 'gspread',
+        'google-auth': 'google.auth',
+        'python-dotenv': 'dotenv'
+    }
     
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
+    for package, module in required_packages.items():
+        # find_spec locates the module without executing its import-time code
+        if find_spec(module) is not None:
             print(f"  ✅ {package}")
-        except ImportError:
+        else:
             missing_packages.append(package)
             print(f"  ❌ {package}")
     
@@ -44,8 +79,9 @@ def check_dependencies():
     print("✅ All dependencies installed!")
     return True
 
+@cache
 def check_credentials():
-    """Check if required credentials are configured"""
+    """Check if required credentials are configured (once per process)"""
     print("\n🔐 Checking credentials...")
     
     credentials_path = os.getenv('GOOGLE_CREDENTIALS_PATH')
@@ -79,16 +115,11 @@ def run_system_test():
     if not check_dependencies():
         return False
     
-    # Add src to path for imports
-    sys.path.insert(0, 'src')
-    
     try:
         # Test ESPN API
         print("\n📡 Testing ESPN API...")
-        from transaction_scraper import NFLTransactionScraper
-        
-        scraper = NFLTransactionScraper()
-        data = scraper.fetch_transactions()
+        automation = get_automation()
+        data = automation.scraper.fetch_transactions()
         
         if 'items' in data:
             print(f"  ✅ ESPN API connected ({len(data['items'])} transactions available)")
@@ -103,10 +134,10 @@ def run_system_test():
     if check_credentials():
         try:
             print("\n📊 Testing Google Sheets...")
-            from google_sheets_updater import GoogleSheetsUpdater
+            if automation.sheets_updater is None:
+                raise RuntimeError("Google Sheets client could not be initialized (see log)")
             
-            updater = GoogleSheetsUpdater()
-            updater.setup_worksheet("Quick_Start_Test")
+            automation.sheets_updater.setup_worksheet("Quick_Start_Test")
             print("  ✅ Google Sheets connected successfully")
             
         except Exception as e:
@@ -116,19 +147,20 @@ def run_system_test():
     print("\n🏆 All system tests passed!")
     return True
 
-def run_sample_scrape():
-    """Run a sample transaction scrape"""
+def run_sample_scrape(max_age=0):
+    """
+    Run a sample transaction scrape
+    
+    Args:
+        max_age: Seconds a cached page fetch may be reused (0 fetches live)
+    """
     print("\n🏈 Running sample NFL transaction scrape...")
     
     if not check_dependencies():
         return False
     
-    sys.path.insert(0, 'src')
-    
     try:
-        from transaction_scraper import NFLTransactionScraper
-        
-        scraper = NFLTransactionScraper()
+        scraper = get_automation(cache_max_age=max_age).scraper
         df = scraper.get_daily_transactions()
         
         if not df.empty:
@@ -162,12 +194,8 @@ def run_full_automation():
     if not check_dependencies() or not check_credentials():
         return False
     
-    sys.path.insert(0, 'src')
-    
     try:
-        from main import NFLTransactionAutomation
-        
-        automation = NFLTransactionAutomation()
+        automation = get_automation()
         result = automation.run_daily_automation()
         
         if result['success']:
@@ -187,19 +215,22 @@ def run_full_automation():
         print(f"❌ Full automation failed: {e}")
         return False
 
-def run_historical_data(start_date, end_date):
-    """Run historical data collection"""
+def run_historical_data(start_date, end_date, max_age=0):
+    """
+    Run historical data collection
+    
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        max_age: Seconds a cached page fetch may be reused (0 fetches live)
+    """
     print(f"\n📚 Collecting historical data from {start_date} to {end_date}...")
     
     if not check_dependencies():
         return False
     
-    sys.path.insert(0, 'src')
-    
     try:
-        from main import NFLTransactionAutomation
-        
-        automation = NFLTransactionAutomation()
+        automation = get_automation(cache_max_age=max_age)
         automation.run_historical_backfill(start_date, end_date)
         
         print("🏆 Historical data collection completed!")
@@ -245,6 +276,9 @@ def setup_environment():
     print("3. ✏️ Edit .env file with your Google Sheet ID")
     print("4. 🧪 Run: python run.py --test")
     
+    # Environment may have changed - recheck credentials on next use
+    check_credentials.cache_clear()
+    
     return True
 
 def install_dependencies():
@@ -253,11 +287,13 @@ def install_dependencies():
     
     try:
         result = subprocess.run([
-            sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'
+            sys.executable, '-m', 'pip', 'install', '--no-input',
+            '--disable-pip-version-check', '--prefer-binary', '-r', 'requirements.txt'
         ], capture_output=True, text=True)
         
         if result.returncode == 0:
             print("✅ Dependencies installed successfully!")
+            check_dependencies.cache_clear()
             return True
         else:
             print(f"❌ Installation failed: {result.stderr}")
@@ -280,6 +316,7 @@ Examples:
   python run.py --setup             # Set up environment
   python run.py --install           # Install dependencies
   python run.py --historical 2024-01-01 2024-01-07  # Historical data
+  python run.py --sample --no-cache  # Sample scrape, always fetch live
         """
     )
     
@@ -295,6 +332,10 @@ Examples:
                        help='Install required dependencies')
     parser.add_argument('--historical', nargs=2, metavar=('START_DATE', 'END_DATE'),
                        help='Collect historical data (YYYY-MM-DD format)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always fetch Spotrac live for --sample/--historical')
+    parser.add_argument('--max-age', type=int, default=86400, metavar='SECONDS',
+                       help='Reuse a cached Spotrac fetch up to this age for --sample/--historical (default: 86400)')
     
     args = parser.parse_args()
     
@@ -305,6 +346,9 @@ Examples:
         from dotenv import load_dotenv
         load_dotenv()
     
+    # Cached page fetches only serve development runs; --full/--test always go live
+    max_age = 0 if args.no_cache else args.max_age
+    
     success = True
     
     if args.install:
@@ -314,12 +358,12 @@ Examples:
     elif args.test:
         success = run_system_test()
     elif args.sample:
-        success = run_sample_scrape()
+        success = run_sample_scrape(max_age)
     elif args.full:
         success = run_full_automation()
     elif args.historical:
         start_date, end_date = args.historical
-        success = run_historical_data(start_date, end_date)
+        success = run_historical_data(start_date, end_date, max_age)
     else:
         # Interactive mode
         print("🎯 QUICK START OPTIONS:")
@@ -341,13 +385,13 @@ Examples:
             elif choice == '3':
                 success = run_system_test()
             elif choice == '4':
-                success = run_sample_scrape()
+                success = run_sample_scrape(max_age)
             elif choice == '5':
                 success = run_full_automation()
             elif choice == '6':
                 start_date = input("Start date (YYYY-MM-DD): ").strip()
                 end_date = input("End date (YYYY-MM-DD): ").strip()
-                success = run_historical_data(start_date, end_date)
+                success = run_historical_data(start_date, end_date, max_age)
             else:
                 print("❌ Invalid option")
                 success = False
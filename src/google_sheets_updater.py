@@ -3,14 +3,18 @@ Google Sheets Updater for NFL Transactions
 Automatically updates Google Sheets with scraped transaction data
 """
 
-import gspread
-from google.oauth2.service_account import Credentials
-import pandas as pd
 from datetime import datetime
+from functools import lru_cache
 import json
 import os
 import logging
-from typing import List, Dict, Optional
+from operator import itemgetter
+from typing import TYPE_CHECKING, ClassVar, Iterable, List, Dict, Optional, Sequence, Tuple, Union
+
+# gspread, google-auth and pandas are imported where they are used so that
+# importing this module stays cheap for code paths that never touch Sheets
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Configure logging
 logging.basicConfig(
@@ -19,12 +23,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# DataFrame columns written to the sheet, in sheet column order (A-G)
+SHEET_COLUMNS = [
+    'date', 'type', 'team', 'player', 'description',
+    'transaction_id', 'scraped_at'
+]
+
+# Pulls one record's sheet values out in column order
+_SHEET_ROW = itemgetter(*SHEET_COLUMNS)
+
+
+@lru_cache(maxsize=4)
+def _make_client(credentials_path: str, scopes: Tuple[str, ...]):
+    """
+    Load service account credentials and build an authorized gspread client
+    
+    Cached per credentials path and scopes so repeated GoogleSheetsUpdater
+    instances skip re-reading the key file and re-authorizing.
+    
+    Args:
+        credentials_path: Path to Google service account credentials
+        scopes: OAuth scopes to request
+        
+    Returns:
+        Authorized gspread client
+    """
+    import gspread
+    from google.auth.transport.requests import AuthorizedSession
+    from google.oauth2.service_account import Credentials
+    from requests.adapters import HTTPAdapter
+    
+    credentials = Credentials.from_service_account_file(
+        credentials_path,
+        scopes=list(scopes)
+    )
+    
+    # One pooled keep-alive session so every Sheets call after the first
+    # reuses an open TLS connection
+    session = AuthorizedSession(credentials)
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+    return gspread.Client(auth=credentials, session=session)
+
+
 class GoogleSheetsUpdater:
     """
     Google Sheets Integration for NFL Transactions
     Handles automatic updates and data management
     """
     
+    # OAuth scopes for the Sheets v4 API (the legacy gdata feeds scope is not needed)
+    _SCOPES: ClassVar[Tuple[str, ...]] = (
+        'https://www.googleapis.com/auth/spreadsheets',
+        'https://www.googleapis.com/auth/drive'
+    )
+    
     def __init__(self, credentials_path: str = None, sheet_id: str = None):
         """
         Initialize Google Sheets connection
@@ -33,12 +85,6 @@ class GoogleSheetsUpdater:
             credentials_path: Path to Google service account credentials
             sheet_id: Google Sheet ID
         """
-        self.scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
         # Get credentials and sheet ID from environment if not provided
         self.credentials_path = credentials_path or os.getenv('GOOGLE_CREDENTIALS_PATH')
         self.sheet_id = sheet_id or os.getenv('GOOGLE_SHEET_ID')
@@ -50,6 +96,15 @@ class GoogleSheetsUpdater:
         self.sheet = None
         self.worksheet = None
         
+        # Transaction IDs already in the active worksheet (loaded on first use)
+        self._existing_ids: Optional[set] = None
+        
+        # Worksheet title -> sheetId, resolved once for batchUpdate requests
+        self._sheet_ids: Optional[Dict[str, int]] = None
+        
+        # Whether Metadata!A1 holds the 'Field' header (None until checked)
+        self._metadata_has_table: Optional[bool] = None
+        
         self.connect()
     
     def connect(self):
@@ -57,14 +112,8 @@ class GoogleSheetsUpdater:
         try:
             logger.info("🔗 Connecting to Google Sheets")
             
-            # Load credentials
-            credentials = Credentials.from_service_account_file(
-                self.credentials_path, 
-                scopes=self.scope
-            )
-            
-            # Authorize client
-            self.client = gspread.authorize(credentials)
+            # Load credentials and authorize (shared across instances)
+            self.client = _make_client(self.credentials_path, self._SCOPES)
             
             # Open spreadsheet
             self.sheet = self.client.open_by_key(self.sheet_id)
@@ -82,6 +131,15 @@ class GoogleSheetsUpdater:
         Args:
             worksheet_name: Name of the worksheet
         """
+        import gspread
+        
+        # Already active - keep the worksheet handle and its cached IDs
+        if self.worksheet is not None and self.worksheet.title == worksheet_name:
+            return
+        
+        # Cached IDs belong to the previously active worksheet
+        self._existing_ids = None
+        
         try:
             # Try to get existing worksheet
             self.worksheet = self.sheet.worksheet(worksheet_name)
@@ -111,123 +169,173 @@ class GoogleSheetsUpdater:
             
             logger.info("✅ Worksheet created and formatted")
     
-    def get_existing_transaction_ids(self) -> List[str]:
+    def get_existing_transaction_ids(self) -> set:
         """
-        Get list of existing transaction IDs to prevent duplicates
+        Get set of existing transaction IDs to prevent duplicates
+        
+        The column is fetched once per worksheet and then kept up to date
+        in memory as transactions are appended. When the Metadata worksheet
+        is known to exist, its A1 cell is read in the same request to tell
+        whether its Field/Value table is in place.
         
         Returns:
-            List of existing transaction IDs
+            Set of existing transaction IDs
         """
+        if self._existing_ids is not None:
+            return self._existing_ids
+        
+        from gspread.utils import absolute_range_name
+        
+        # Get raw values below the header in transaction ID column (column F)
+        ranges = [absolute_range_name(self.worksheet.title, 'F2:F')]
+        check_metadata = (
+            self._metadata_has_table is None and
+            self._sheet_ids is not None and "Metadata" in self._sheet_ids
+        )
+        if check_metadata:
+            ranges.append(absolute_range_name("Metadata", 'A1'))
+        
         try:
-            # Get all values from transaction ID column (column F)
-            values = self.worksheet.col_values(6)  # Column F (Transaction ID)
+            response = self.sheet.values_batch_get(
+                ranges=ranges,
+                params={
+                    'majorDimension': 'COLUMNS',
+                    'valueRenderOption': 'UNFORMATTED_VALUE'
+                }
+            )
+            value_ranges = response.get('valueRanges', [{}])
+            values = value_ranges[0].get('values', [[]])[0]
             
-            # Remove header and empty values
-            transaction_ids = [val for val in values[1:] if val]
+            if check_metadata and len(value_ranges) > 1:
+                header = value_ranges[1].get('values', [[None]])[0][0]
+                self._metadata_has_table = header == 'Field'
             
-            logger.info(f"📋 Found {len(transaction_ids)} existing transactions")
-            return transaction_ids
+            # Remove empty values
+            self._existing_ids = {str(val) for val in values if val != ''}
+            
+            logger.info(f"📋 Found {len(self._existing_ids)} existing transactions")
+            return self._existing_ids
             
         except Exception as e:
             logger.warning(f"⚠️ Could not retrieve existing transaction IDs: {e}")
-            return []
+            return set()
     
-    def filter_new_transactions(self, df: pd.DataFrame) -> pd.DataFrame:
+    def filter_new_transactions(self, rows: List[Dict]) -> List[Dict]:
         """
         Filter out transactions that already exist in the sheet
         
         Args:
-            df: DataFrame with new transactions
+            rows: Transaction records
             
         Returns:
-            DataFrame with only new transactions
+            Records for new transactions only
         """
         existing_ids = self.get_existing_transaction_ids()
         
         if not existing_ids:
             logger.info("📝 No existing transactions, all data is new")
-            return df
+            return rows
         
         # Filter out existing transactions
-        new_df = df[~df['transaction_id'].isin(existing_ids)]
+        new_rows = [row for row in rows if row['transaction_id'] not in existing_ids]
         
-        logger.info(f"🔍 Filtered {len(df) - len(new_df)} duplicate transactions")
-        logger.info(f"📊 {len(new_df)} new transactions to add")
+        logger.info(f"🔍 Filtered {len(rows) - len(new_rows)} duplicate transactions")
+        logger.info(f"📊 {len(new_rows)} new transactions to add")
         
-        return new_df
+        return new_rows
+    
+    def _metadata_timestamp(self) -> str:
+        """Current run time as written to the Metadata 'Last Updated' cell (B2)"""
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def _metadata_rows(self) -> List[List[str]]:
+        """Metadata table contents stamped with the current run time"""
+        return [
+            ["Field", "Value"],
+            ["Last Updated", self._metadata_timestamp()],
+            ["Data Source", "ESPN NFL Transactions API"],
+            ["Automation", "GitHub Actions"],
+            ["Status", "Active"]
+        ]
+    
+    @staticmethod
+    def _row_data(rows: Iterable[Sequence]) -> List[Dict]:
+        """Convert plain rows into Sheets API RowData (blank out missing cells)"""
+        return [
+            {'values': [
+                {'userEnteredValue': {'stringValue': '' if value is None or value != value else str(value)}}
+                for value in row
+            ]}
+            for row in rows
+        ]
     
-    def append_transactions(self, df: pd.DataFrame) -> int:
+    def _get_sheet_id(self, title: str) -> Optional[int]:
         """
-        Append new transactions to Google Sheet
+        Look up a worksheet's sheetId, fetching spreadsheet metadata only once
         
         Args:
-            df: DataFrame with transaction data
+            title: Worksheet title
             
         Returns:
-            Number of transactions added
+            sheetId, or None if the worksheet does not exist
         """
-        if df.empty:
-            logger.info("📭 No new transactions to add")
-            return 0
+        if self._sheet_ids is None:
+            metadata = self.sheet.fetch_sheet_metadata()
+            self._sheet_ids = {
+                ws['properties']['title']: ws['properties']['sheetId']
+                for ws in metadata.get('sheets', [])
+            }
+        return self._sheet_ids.get(title)
+    
+    def _get_metadata_sheet_id(self) -> int:
+        """
+        Get the Metadata worksheet's sheetId, creating the worksheet if needed
         
-        try:
-            # Prepare data for Google Sheets
-            data = []
-            for _, row in df.iterrows():
-                data.append([
-                    row['date'],
-                    row['type'],
-                    row['team'],
-                    row['player'],
-                    row['description'],
-                    row['transaction_id'],
-                    row['scraped_at']
-                ])
-            
-            # Append to worksheet
-            self.worksheet.append_rows(data, value_input_option='USER_ENTERED')
-            
-            logger.info(f"✅ Successfully added {len(data)} transactions to Google Sheets")
-            return len(data)
-            
-        except Exception as e:
-            logger.error(f"❌ Error appending transactions: {e}")
-            raise
+        Returns:
+            sheetId of the Metadata worksheet
+        """
+        sheet_id = self._get_sheet_id("Metadata")
+        
+        if sheet_id is not None:
+            return sheet_id
+        
+        meta_sheet = self.sheet.add_worksheet(title="Metadata", rows=10, cols=2)
+        self._sheet_ids["Metadata"] = meta_sheet.id
+        self._metadata_has_table = False
+        return meta_sheet.id
     
-    def update_metadata(self):
-        """Update metadata sheet with last update info"""
-        try:
-            # Try to get or create metadata worksheet
-            try:
-                meta_sheet = self.sheet.worksheet("Metadata")
-            except gspread.WorksheetNotFound:
-                meta_sheet = self.sheet.add_worksheet(title="Metadata", rows=10, cols=2)
-                meta_sheet.append_row(["Field", "Value"])
-            
-            # Update last run time
-            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Clear existing metadata and add new
-            meta_sheet.clear()
-            meta_sheet.append_rows([
-                ["Field", "Value"],
-                ["Last Updated", current_time],
-                ["Data Source", "ESPN NFL Transactions API"],
-                ["Automation", "GitHub Actions"],
-                ["Status", "Active"]
-            ])
-            
-            logger.info("📊 Updated metadata worksheet")
+    def _metadata_request(self, sheet_id: int) -> Dict:
+        """
+        Build the batchUpdate request that stamps the Metadata worksheet
+        
+        Args:
+            sheet_id: Metadata worksheet sheetId
             
-        except Exception as e:
-            logger.warning(f"⚠️ Could not update metadata: {e}")
+        Returns:
+            updateCells request
+        """
+        # Only a sheet whose A1 was read as 'Field' just needs its timestamp
+        # cell (B2) refreshed; a new, cleared or unchecked one gets the full table
+        if not self._metadata_has_table:
+            start, rows = (0, 0), self._metadata_rows()
+        else:
+            start, rows = (1, 1), [[self._metadata_timestamp()]]
+        
+        return {
+            'updateCells': {
+                'start': {'sheetId': sheet_id, 'rowIndex': start[0], 'columnIndex': start[1]},
+                'rows': self._row_data(rows),
+                'fields': 'userEnteredValue'
+            }
+        }
     
-    def process_daily_update(self, df: pd.DataFrame, worksheet_name: str = "NFL_Transactions") -> Dict:
+    def process_daily_update(self, transactions: Union[List[Dict], 'pd.DataFrame'],
+                             worksheet_name: str = "NFL_Transactions") -> Dict:
         """
         Complete daily update process
         
         Args:
-            df: DataFrame with transaction data
+            transactions: Transaction records, or a DataFrame of them
             worksheet_name: Name of the worksheet
             
         Returns:
@@ -235,24 +343,71 @@ class GoogleSheetsUpdater:
         """
         logger.info("🚀 Starting daily Google Sheets update")
         
+        # Materialize DataFrame input as records once for the write path,
+        # keeping only the columns the sheet stores
+        if isinstance(transactions, list):
+            rows = transactions
+        else:
+            rows = transactions[SHEET_COLUMNS].to_dict('records')
+        
         try:
             # Setup worksheet
             self.setup_worksheet(worksheet_name)
             
-            # Filter new transactions
-            new_df = self.filter_new_transactions(df)
+            # Resolve the Metadata sheet first so the existing-ID read can
+            # check its header in the same request. Metadata is best-effort
+            # and must never cost the day's append.
+            try:
+                metadata_sheet_id = self._get_metadata_sheet_id()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not update metadata: {e}")
+                metadata_sheet_id = None
+            
+            new_rows = self.filter_new_transactions(rows)
+            
+            added_count = len(new_rows)
+            
+            # Append new transactions and overwrite metadata in one batchUpdate
+            requests = []
+            
+            if added_count:
+                requests.append({
+                    'appendCells': {
+                        'sheetId': self.worksheet.id,
+                        # One pass from records to RowData, no intermediate value lists
+                        'rows': self._row_data(map(_SHEET_ROW, new_rows)),
+                        'fields': 'userEnteredValue'
+                    }
+                })
+            else:
+                logger.info("📭 No new transactions to add")
+            
+            metadata_written = False
+            if metadata_sheet_id is not None:
+                try:
+                    self.sheet.batch_update({
+                        'requests': requests + [self._metadata_request(metadata_sheet_id)]
+                    })
+                    metadata_written = True
+                    self._metadata_has_table = True
+                except Exception as e:
+                    # batchUpdate is atomic, so nothing was appended - resend
+                    # the rows alone below and re-check the sheet next run
+                    logger.warning(f"⚠️ Could not update metadata: {e}")
+                    self._sheet_ids = None
+                    self._metadata_has_table = None
             
-            # Add new transactions
-            added_count = self.append_transactions(new_df)
+            if not metadata_written and requests:
+                self.sheet.batch_update({'requests': requests})
             
-            # Update metadata
-            self.update_metadata()
+            if self._existing_ids is not None:
+                self._existing_ids.update(row['transaction_id'] for row in new_rows)
             
             result = {
                 'success': True,
-                'total_transactions': len(df),
+                'total_transactions': len(rows),
                 'new_transactions': added_count,
-                'duplicate_transactions': len(df) - added_count,
+                'duplicate_transactions': len(rows) - added_count,
                 'worksheet_name': worksheet_name,
                 'updated_at': datetime.now().isoformat()
             }
@@ -271,7 +426,7 @@ def main():
     
     # This would normally be called from the main scraper
     # For testing, you can create sample data
-    sample_data = pd.DataFrame([
+    sample_data = [
         {
             'date': '2024-01-01',
             'type': 'Signing',
@@ -281,7 +436,7 @@ def main():
             'transaction_id': 'test_001',
             'scraped_at': datetime.now().isoformat()
         }
-    ])
+    ]
     
     try:
         updater = GoogleSheetsUpdater()
@@ -6,49 +6,65 @@ Orchestrates daily scraping and Google Sheets updates
 import os
 import sys
 import logging
+import time
 from datetime import datetime
 from dotenv import load_dotenv
-import pandas as pd
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 # Load environment variables
 load_dotenv()
 
 # Import our custom modules
-from transaction_scraper import NFLTransactionScraper
-from google_sheets_updater import GoogleSheetsUpdater
+from transaction_scraper import NFLTransactionScraper, SEEN_IDS_FILE
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Configure logging (set LOG_TO_STDOUT=false to log to the file only);
+# the log directory must exist before the file handler opens it at import
+os.makedirs('logs', exist_ok=True)
+log_handlers = [logging.FileHandler('logs/nfl_automation.log')]
+if os.getenv('LOG_TO_STDOUT', 'true').lower() != 'false':
+    log_handlers.append(logging.StreamHandler(sys.stdout))
 
-# Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/nfl_automation.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+    handlers=log_handlers
 )
 logger = logging.getLogger(__name__)
 
+# Seconds a connectivity probe result is reused before hitting the service again
+PROBE_TTL = 60
+
 class NFLTransactionAutomation:
     """
     Main automation class that orchestrates the entire process
     ESPN API → Data Processing → Google Sheets → Ready for Airtable
     """
     
-    def __init__(self):
-        """Initialize the automation system"""
+    def __init__(self, cache_max_age: int = 0):
+        """
+        Initialize the automation system
+        
+        Args:
+            cache_max_age: Seconds a cached Spotrac page fetch may be reused without
+                revalidation (0 revalidates on every run)
+        """
         logger.info("🚀 Initializing NFL Transaction Automation System")
         
-        # Create logs directory if it doesn't exist
-        os.makedirs('logs', exist_ok=True)
+        # Create data directory if it doesn't exist
         os.makedirs('data', exist_ok=True)
         
         # Initialize components
-        self.scraper = NFLTransactionScraper()
+        self.scraper = NFLTransactionScraper(cache_max_age=cache_max_age, seen_ids_file=SEEN_IDS_FILE)
         self.sheets_updater = None
+        self._sheets_probed_at = None
         
         # Initialize Google Sheets if credentials are available
         try:
+            from google_sheets_updater import GoogleSheetsUpdater
+            
             self.sheets_updater = GoogleSheetsUpdater()
             logger.info("✅ Google Sheets integration initialized")
         except Exception as e:
@@ -91,23 +107,8 @@ class NFLTransactionAutomation:
                 results['success'] = True
                 return results
             
-            # Step 2: Save to CSV (backup)
-            logger.info("💾 Step 2: Saving transactions to CSV")
-            csv_filename = self.scraper.save_to_csv(transactions_df)
-            results['csv_file'] = csv_filename
-            results['transactions_saved_csv'] = len(transactions_df)
-            
-            # Step 3: Update Google Sheets (if available)
-            if self.sheets_updater:
-                logger.info("📊 Step 3: Updating Google Sheets")
-                sheets_result = self.sheets_updater.process_daily_update(transactions_df)
-                results['transactions_added_sheets'] = sheets_result['new_transactions']
-                results['duplicate_transactions'] = sheets_result['duplicate_transactions']
-            else:
-                logger.info("⏭️ Step 3: Skipping Google Sheets (not configured)")
-            
-            # Step 4: Generate summary report
-            self.generate_summary_report(transactions_df, results)
+            # Steps 2-4: CSV backup, Google Sheets, summary
+            self.publish_transactions(transactions_df, results)
             
             results['success'] = True
             results['end_time'] = datetime.now().isoformat()
@@ -122,7 +123,45 @@ class NFLTransactionAutomation:
         
         return results
     
-    def generate_summary_report(self, df: pd.DataFrame, results: Dict):
+    def publish_transactions(self, transactions_df: 'pd.DataFrame', results: Dict,
+                             csv_filename: Optional[str] = None):
+        """
+        Save transactions to CSV, push them to Google Sheets and report
+        
+        Args:
+            transactions_df: DataFrame with transaction data
+            results: Results dictionary, updated in place
+            csv_filename: Optional CSV path, defaults to today's file
+        """
+        # Step 2: Save to CSV (backup)
+        logger.info("💾 Step 2: Saving transactions to CSV")
+        csv_filename = self.scraper.save_to_csv(transactions_df, csv_filename)
+        results['csv_file'] = csv_filename
+        results['transactions_saved_csv'] = len(transactions_df)
+        
+        # Typed, compressed archive alongside the CSV that Zapier reads
+        self.scraper.save_to_parquet(transactions_df, f"{os.path.splitext(csv_filename)[0]}.parquet")
+        
+        # Step 3: Update Google Sheets (if available) - the CSV keeps every
+        # row, but Sheets only needs what no earlier run wrote there
+        if self.sheets_updater:
+            logger.info("📊 Step 3: Updating Google Sheets")
+            unseen_df = self.scraper.filter_unseen(transactions_df)
+            sheets_result = self.sheets_updater.process_daily_update(unseen_df)
+            results['transactions_added_sheets'] = sheets_result['new_transactions']
+            results['duplicate_transactions'] = (
+                sheets_result['duplicate_transactions'] + len(transactions_df) - len(unseen_df)
+            )
+            
+            # Only remember IDs once they are safely in Sheets
+            self.scraper.mark_seen(dict(zip(unseen_df['transaction_id'], unseen_df['date'])))
+        else:
+            logger.info("⏭️ Step 3: Skipping Google Sheets (not configured)")
+        
+        # Step 4: Generate summary report
+        self.generate_summary_report(transactions_df, results)
+    
+    def generate_summary_report(self, df: 'pd.DataFrame', results: Dict):
         """
         Generate and log summary report
         
@@ -176,10 +215,10 @@ class NFLTransactionAutomation:
             'overall_status': False
         }
         
-        # Test ESPN API
+        # Test ESPN API (a page fetched within PROBE_TTL, even by another run, counts)
         try:
             logger.info("🔍 Testing ESPN API connection")
-            test_data = self.scraper.fetch_transactions()
+            test_data = self.scraper.load_page_transactions(max_age=PROBE_TTL)
             test_results['espn_api'] = True
             logger.info("✅ ESPN API connection successful")
         except Exception as e:
@@ -187,21 +226,29 @@ class NFLTransactionAutomation:
         
         # Test Google Sheets
         if self.sheets_updater:
-            try:
-                logger.info("🔍 Testing Google Sheets connection")
-                self.sheets_updater.setup_worksheet("Test_Connection")
+            if self._sheets_probed_at and time.time() - self._sheets_probed_at < PROBE_TTL:
                 test_results['google_sheets'] = True
-                logger.info("✅ Google Sheets connection successful")
-            except Exception as e:
-                logger.error(f"❌ Google Sheets test failed: {e}")
+                logger.info("✅ Google Sheets connection verified recently")
+            else:
+                try:
+                    logger.info("🔍 Testing Google Sheets connection")
+                    self.sheets_updater.setup_worksheet("Test_Connection")
+                    test_results['google_sheets'] = True
+                    self._sheets_probed_at = time.time()
+                    logger.info("✅ Google Sheets connection successful")
+                except Exception as e:
+                    logger.error(f"❌ Google Sheets test failed: {e}")
         
         # Test file system
         try:
             logger.info("🔍 Testing file system access")
+            import pandas as pd
+            
             test_df = pd.DataFrame([{'test': 'data'}])
             test_file = self.scraper.save_to_csv(test_df, 'data/connectivity_test.csv')
-            if os.path.exists(test_file):
-                os.remove(test_file)  # Clean up
+            for path in (test_file, f"{test_file}.hash"):
+                if os.path.exists(path):
+                    os.remove(path)  # Clean up
             test_results['file_system'] = True
             logger.info("✅ File system access successful")
         except Exception as e:
@@ -212,42 +259,58 @@ class NFLTransactionAutomation:
         
         return test_results
     
-    def run_historical_backfill(self, start_date: str, end_date: str):
+    def run_historical_backfill(self, start_date: str, end_date: str) -> Dict:
         """
         Run backfill for historical data
         
+        Spotrac lists all recent transactions on one page, so the page is
+        fetched once and the whole window is written with one CSV save and
+        one Google Sheets update.
+        
         Args:
             start_date: Start date in YYYY-MM-DD format
             end_date: End date in YYYY-MM-DD format
+            
+        Returns:
+            Dictionary with backfill results
         """
         logger.info(f"📚 Starting historical backfill from {start_date} to {end_date}")
         
-        from datetime import datetime, timedelta
-        
-        current_date = datetime.strptime(start_date, '%Y-%m-%d')
-        end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-        
-        total_transactions = 0
+        results = {
+            'success': False,
+            'start_time': datetime.now().isoformat(),
+            'date_processed': f"{start_date} to {end_date}",
+            'transactions_found': 0,
+            'transactions_saved_csv': 0,
+            'transactions_added_sheets': 0,
+            'csv_file': None,
+            'errors': []
+        }
         
-        while current_date <= end_date_obj:
-            date_str = current_date.strftime('%Y-%m-%d')
-            logger.info(f"📅 Processing {date_str}")
+        try:
+            transactions_df = self.scraper.get_transactions_between(start_date, end_date)
+            results['transactions_found'] = len(transactions_df)
             
-            try:
-                result = self.run_daily_automation(date_str)
-                total_transactions += result['transactions_found']
-                
-                # Small delay to be respectful to ESPN API
-                import time
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to process {date_str}: {e}")
+            if not transactions_df.empty:
+                self.publish_transactions(
+                    transactions_df,
+                    results,
+                    f"data/spotrac_nfl_transactions_{start_date}_to_{end_date}.csv"
+                )
+            else:
+                logger.info("📭 No transactions found in backfill window")
+            
+            results['success'] = True
+            results['end_time'] = datetime.now().isoformat()
             
-            current_date += timedelta(days=1)
+        except Exception as e:
+            logger.error(f"❌ Historical backfill failed: {e}")
+            results['errors'].append(str(e))
+            results['end_time'] = datetime.now().isoformat()
+            raise
         
-        logger.info(f"🏆 Historical backfill completed! Total transactions: {total_transactions}")
-
+        logger.info(f"🏆 Historical backfill completed! Total transactions: {results['transactions_found']}")
+        return results
 
 def main():
     """Main execution function"""
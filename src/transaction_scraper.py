@@ -4,14 +4,28 @@ Scrapes live NFL transactions from Spotrac.com
 """
 
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 import re
 import logging
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional, Union
 from bs4 import BeautifulSoup
 import time
 import os
+import json
+import hashlib
+import threading
+from functools import lru_cache
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    lxml_html = None
+
+# pandas is imported where frames are built so fetching and parsing stay cheap
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Configure logging
 logging.basicConfig(
@@ -20,19 +34,191 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# BeautifulSoup tree builder: the C-backed lxml parser when installed,
+# otherwise the pure-Python stdlib parser
+HTML_PARSER = 'lxml' if lxml_html is not None else 'html.parser'
+
+# Candidate transaction containers, most specific first. A page is searched
+# once for all of them and the first kind present on it is used.
+TRANSACTION_SELECTOR = 'div.transaction, tr, div.row, li'
+
+# XPath equivalent, in the same order (the class tests match one class among several)
+TRANSACTION_XPATH = ' | '.join((
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' transaction ')]",
+    '//tr',
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' row ')]",
+    '//li'
+))
+
+
+def _container_rank(tag: str, classes: List[str]) -> int:
+    """Position of a matched container's kind in TRANSACTION_SELECTOR"""
+    if tag == 'div':
+        return 0 if 'transaction' in classes else 2
+    return 1 if tag == 'tr' else 3
+
+
+def _first_container_kind(elements: List, rank) -> List:
+    """
+    Keep the matched containers of the most specific kind present
+    
+    Args:
+        elements: Containers matched by one selector pass, in document order
+        rank: Function mapping an element to its _container_rank
+        
+    Returns:
+        Elements of the first non-empty kind, in document order
+    """
+    kinds = [[], [], [], []]
+    for element in elements:
+        kinds[rank(element)].append(element)
+    return next((kind for kind in kinds if kind), [])
+
+
+# Transaction text patterns, compiled once at import
+MONTH_NUMBERS = {
+    month: number for number, month in enumerate(
+        ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1
+    )
+}
+MONTH_PATTERN = '(?:' + '|'.join(MONTH_NUMBERS) + ')'
+
+# "Player Name (POS)" at the start of a row
+PLAYER_PREFIX_RE = re.compile(r'^([^(]+)\s*\(([^)]+)\)')
+
+# Captured parts of a "Jul 03, 2025 - details" transaction line: the
+# details follow the first " - " after the date, and may span lines when
+# they come from an element's text
+DATE_RE = re.compile('(' + MONTH_PATTERN + r')\s+(\d+),\s+(\d+)(?s:.*?)\s-\s((?s:.*))')
+
+# Any transaction keyword, case-insensitive, without lowercasing a copy of the text
+TRANSACTION_KEYWORD_RE = re.compile(
+    r'signed|released|traded|waived|claimed|contract|extension|suspended|retired',
+    re.IGNORECASE
+)
+
+# Transaction type rules in priority order: the first rule whose keywords
+# all appear anywhere in the description wins
+TRANSACTION_TYPE_RULES = (
+    ('Contract Extension', ('signed', 'extension')),
+    ('Signing', ('signed',)),
+    ('Trade', ('traded',)),
+    ('Release', ('released',)),
+    ('Waiver', ('waived',)),
+    ('Waiver Claim', ('claimed',)),
+    ('Suspension', ('suspended',)),
+    ('Retirement', ('retired',)),
+)
+
+# All rules as one anchored alternation of lookaheads; match.lastgroup names
+# the winning rule, so classification is a single case-insensitive C-level call
+TRANSACTION_TYPE_RE = re.compile(
+    '|'.join(
+        ''.join(f'(?=.*{keyword})' for keyword in keywords) + f'(?P<rule{index}>)'
+        for index, (_, keywords) in enumerate(TRANSACTION_TYPE_RULES)
+    ),
+    re.IGNORECASE | re.DOTALL
+)
+TRANSACTION_TYPE_BY_GROUP = {
+    f'rule{index}': transaction_type
+    for index, (transaction_type, _) in enumerate(TRANSACTION_TYPE_RULES)
+}
+
+# Plain-text page layout: a "Player Name (POS)" line followed by the first
+# later "Jul 03, 2025 - details" line. Other lines in between are skipped,
+# unless another player line comes first and takes over the date line.
+# Surrounding whitespace is left outside the groups so matches need no
+# further stripping
+PLAYER_LINE_PATTERN = r'[ \t]*[^\n(]+\([^)\n]+\)[ \t]*\r?$'
+TRANSACTION_BLOCK_RE = re.compile(
+    r'^[ \t]*([^\n(]+?)[ \t]*\([ \t]*([^)\n]+?)[ \t]*\)[ \t]*\r?\n'
+    r'(?:(?!' + PLAYER_LINE_PATTERN + r')[^\n]*\n)*?\s*'
+    r'([^\n]*?' + MONTH_PATTERN + r'[ \t]+\d+,[ \t]+\d+[ \t]*-[^\n]*?)[ \t\r]*$',
+    re.MULTILINE
+)
+
+# "with Team (ABR)" wins over "by Team (ABR)" anywhere in the description,
+# so the two are kept as separate searches rather than one alternation
+TEAM_WITH_RE = re.compile(r'with\s+([^(]+)\s*\(([^)]+)\)')
+TEAM_BY_RE = re.compile(r'by\s+([^(]+)\s*\(([^)]+)\)')
+
+# Browser-like headers sent with every Spotrac request
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# On-disk cache of parsed transaction pages, keyed by page URL
+CACHE_DIR = os.path.join('cache', 'spotrac')
+
+# Fixed schema of a parsed transaction, in output column order
+TRANSACTION_COLUMNS = [
+    'date', 'type', 'team', 'player', 'position',
+    'description', 'transaction_id', 'scraped_at', 'source'
+]
+
+# Transaction IDs already published by earlier runs, with their dates
+SEEN_IDS_FILE = os.path.join('data', 'seen_transaction_ids.json')
+
+# Days of transactions fetched per run; seen IDs older than this are pruned
+DAYS_BACK = 7
+
+
+@lru_cache(maxsize=1)
+def _make_session() -> requests.Session:
+    """
+    Build the HTTP session shared by every scraper in this process
+    
+    Repeated scrapes (connectivity probe, daily run, backfill) reuse its
+    kept-alive connections instead of paying a new TCP + TLS handshake.
+    
+    Returns:
+        requests.Session with browser headers, pooling and retries mounted
+    """
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    
+    # Pooled keep-alive connections; transient failures are retried with
+    # jittered exponential backoff so parallel callers don't retry in lockstep
+    retries = Retry(
+        total=3,
+        backoff_factor=1,
+        backoff_max=10,
+        backoff_jitter=1,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD'])
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 class SpotracNFLScraper:
     """
     Spotrac NFL Transaction Scraper
     Fetches live NFL transactions from Spotrac.com
     """
     
-    def __init__(self):
+    def __init__(self, cache_max_age: int = 0, seen_ids_file: Optional[str] = None):
+        """
+        Initialize the scraper
+        
+        Args:
+            cache_max_age: Seconds a cached page fetch may be reused without
+                revalidation (0 revalidates with Spotrac on every fetch)
+            seen_ids_file: Optional JSON file of transaction IDs already written to
+                Google Sheets, which filter_unseen drops on later runs
+        """
         self.base_url = "https://www.spotrac.com/nfl/transactions"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.cache_max_age = cache_max_age
+        self._cache_lock = threading.Lock()
+        self.seen_ids_file = seen_ids_file
+        self.seen_ids = self.load_seen_ids()
+        
+        # ETag / Last-Modified of the last page response
+        self.page_validators = {}
+        self.headers = REQUEST_HEADERS
+        self.session = _make_session()
         
         # Team abbreviation mapping
         self.team_mapping = {
@@ -49,7 +235,7 @@ class SpotracNFLScraper:
             'TEN': 'Tennessee Titans', 'WAS': 'Washington Commanders'
         }
     
-    def fetch_transactions(self, days_back: int = 7) -> List[Dict]:
+    def fetch_transactions(self, days_back: int = DAYS_BACK) -> List[Dict]:
         """
         Fetch transactions from Spotrac
         
@@ -62,13 +248,7 @@ class SpotracNFLScraper:
         logger.info(f"🏈 Fetching NFL transactions from Spotrac (last {days_back} days)")
         
         try:
-            response = self.session.get(self.base_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Parse transactions from the page
-            transactions = self.parse_spotrac_page(soup, response.text)
+            transactions = self.load_page_transactions()
             
             # Filter by date range
             cutoff_date = datetime.now() - timedelta(days=days_back)
@@ -90,94 +270,304 @@ class SpotracNFLScraper:
             logger.error(f"❌ Error fetching transactions: {e}")
             raise
     
+    def fetch_page_transactions(self, cached: Optional[Dict] = None) -> List[Dict]:
+        """
+        Download and parse the Spotrac transactions page
+        
+        Args:
+            cached: Optional cache entry; its ETag / Last-Modified make the request
+                conditional and its transactions are returned (restamped with
+                this fetch's scraped_at) if Spotrac answers 304
+        
+        Returns:
+            List of all transaction dictionaries on the page
+        """
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        response = self.session.get(self.base_url, headers=headers, timeout=30)
+        
+        if cached and response.status_code == 304:
+            logger.info("📦 Spotrac page unchanged since last fetch")
+            self.page_validators = {key: cached.get(key) for key in ('etag', 'last_modified')}
+            
+            # The page was confirmed current now, so the rows were scraped now
+            scraped_at = datetime.now().isoformat()
+            return [
+                {**transaction, 'scraped_at': scraped_at}
+                for transaction in cached['transactions']
+            ]
+        
+        response.raise_for_status()
+        self.page_validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        
+        # Parse transactions from the page
+        return self.parse_page_content(response.content, response.text)
+    
+    def load_page_transactions(self, max_age: Optional[int] = None) -> List[Dict]:
+        """
+        Get page transactions from the on-disk cache, revalidating on expiry
+        
+        Entries older than max_age (every entry when max_age is 0) are
+        revalidated with a conditional GET, so an unchanged page costs a 304
+        and no parsing even on live runs.
+        
+        Args:
+            max_age: Seconds a cached fetch may be reused without asking
+                Spotrac, defaults to cache_max_age
+        
+        Returns:
+            List of all transaction dictionaries on the page
+        """
+        if max_age is None:
+            max_age = self.cache_max_age
+        
+        # Hold the lock across fetch + write so concurrent callers
+        # wait for the first fetch instead of all hitting Spotrac
+        with self._cache_lock:
+            cache_key = hashlib.sha1(self.base_url.encode('utf-8')).hexdigest()
+            cache_file = os.path.join(CACHE_DIR, f"{cache_key}.json")
+            cached = None
+            
+            try:
+                with open(cache_file, encoding='utf-8') as f:
+                    cached = json.load(f)
+                transactions = cached['transactions']
+                
+                if max_age > 0 and time.time() - os.path.getmtime(cache_file) < max_age:
+                    logger.info(f"📦 Using cached Spotrac page ({len(transactions)} transactions)")
+                    return transactions
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"⚠️ Ignoring unreadable cache file {cache_file}: {e}")
+                cached = None
+            
+            # Expired entries are revalidated with their ETag / Last-Modified
+            transactions = self.fetch_page_transactions(cached)
+            
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({**self.page_validators, 'transactions': transactions}, f)
+            
+            return transactions
+    
+    def load_seen_ids(self) -> Dict[str, str]:
+        """
+        Load transaction IDs published by earlier runs within the scrape window
+        
+        Returns:
+            Dict of transaction ID -> transaction date (empty if tracking is
+            disabled, there is no file yet, or it predates stored dates)
+        """
+        if not self.seen_ids_file or not os.path.exists(self.seen_ids_file):
+            return {}
+        
+        try:
+            with open(self.seen_ids_file, encoding='utf-8') as f:
+                seen_ids = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable seen IDs file {self.seen_ids_file}: {e}")
+            return {}
+        
+        # Older files held bare IDs with no dates to prune by; Sheets-side
+        # de-duplication still covers anything they listed
+        if not isinstance(seen_ids, dict):
+            return {}
+        
+        return self.prune_seen_ids(seen_ids)
+    
+    def prune_seen_ids(self, seen_ids: Dict[str, str]) -> Dict[str, str]:
+        """
+        Drop seen IDs dated before the DAYS_BACK scrape window
+        
+        Older transactions are never fetched again, and forgetting them lets
+        a row deleted from the sheet be re-added while it is still scraped.
+        
+        Args:
+            seen_ids: Dict of transaction ID -> transaction date (YYYY-MM-DD)
+            
+        Returns:
+            Dict of the IDs dated within the window
+        """
+        # ISO dates compare correctly as strings
+        cutoff = (datetime.now() - timedelta(days=DAYS_BACK)).strftime('%Y-%m-%d')
+        return {
+            transaction_id: date for transaction_id, date in seen_ids.items()
+            if date >= cutoff
+        }
+    
+    def filter_unseen(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Drop transactions an earlier run already wrote to Google Sheets
+        
+        Args:
+            df: DataFrame with transaction data
+            
+        Returns:
+            DataFrame of transactions not yet marked seen
+        """
+        if not self.seen_ids or df.empty:
+            return df
+        
+        return df[~df['transaction_id'].isin(self.seen_ids.keys())]
+    
+    def mark_seen(self, transactions: Dict[str, str]):
+        """
+        Record transaction IDs as written to Google Sheets and persist them,
+        pruning IDs that have left the scrape window
+        
+        Args:
+            transactions: Dict of transaction ID -> transaction date for the
+                transactions just written
+        """
+        self.seen_ids = self.prune_seen_ids({**self.seen_ids, **transactions})
+        
+        if not self.seen_ids_file:
+            return
+        
+        directory = os.path.dirname(self.seen_ids_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # Write then rename so an interrupted run never leaves a truncated file
+        temp_file = f"{self.seen_ids_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(self.seen_ids.items())), f)
+        os.replace(temp_file, self.seen_ids_file)
+    
+    def parse_page_content(self, content: bytes, html_content: str) -> List[Dict]:
+        """
+        Parse transactions from raw page bytes
+        
+        Uses lxml XPath directly when lxml is installed, so candidate rows are
+        located and flattened to text in C without building BeautifulSoup
+        nodes; BeautifulSoup remains the fallback for pages lxml rejects.
+        
+        Args:
+            content: Raw response body
+            html_content: Decoded response text for the text-pattern fallback
+            
+        Returns:
+            List of transaction dictionaries
+        """
+        if lxml_html is not None:
+            try:
+                return self.parse_spotrac_tree(lxml_html.fromstring(content), html_content)
+            except (etree.ParserError, ValueError) as e:
+                logger.warning(f"⚠️ lxml could not parse page, using BeautifulSoup: {e}")
+        
+        soup = BeautifulSoup(content, HTML_PARSER)
+        return self.parse_spotrac_page(soup, html_content)
+    
+    def parse_spotrac_tree(self, tree, html_content: str) -> List[Dict]:
+        """
+        Parse transactions from an lxml-parsed Spotrac page
+        """
+        try:
+            # Same container fallbacks as parse_spotrac_page, as one XPath union
+            transaction_elements = _first_container_kind(
+                tree.xpath(TRANSACTION_XPATH),
+                lambda element: _container_rank(element.tag, element.get('class', '').split())
+            )
+            texts = [element.text_content() for element in transaction_elements]
+        except Exception as e:
+            logger.warning(f"Structured parsing failed: {e}")
+            texts = []
+        
+        return self.parse_page_texts(texts, html_content)
+    
     def parse_spotrac_page(self, soup, html_content: str) -> List[Dict]:
         """
         Parse transactions from Spotrac page
         """
+        try:
+            # Look for common transaction containers in a single tree walk
+            transaction_elements = _first_container_kind(
+                soup.select(TRANSACTION_SELECTOR),
+                lambda element: _container_rank(element.name, element.get('class') or [])
+            )
+            texts = [element.get_text() for element in transaction_elements]
+        except Exception as e:
+            logger.warning(f"Structured parsing failed: {e}")
+            texts = []
+        
+        return self.parse_page_texts(texts, html_content)
+    
+    def parse_page_texts(self, texts: List[str], html_content: str) -> List[Dict]:
+        """
+        Parse transactions from candidate element texts, falling back to
+        text pattern matching over the whole page
+        
+        Args:
+            texts: Text content of candidate transaction elements
+            html_content: Decoded page text
+            
+        Returns:
+            List of transaction dictionaries
+        """
         transactions = []
         
+        # One timestamp for the whole page instead of one per transaction
+        scraped_at = datetime.now().isoformat()
+        
         # Method 1: Try to find structured data
         try:
-            # Look for common transaction containers
-            transaction_elements = (
-                soup.find_all('div', class_='transaction') or
-                soup.find_all('tr') or
-                soup.find_all('div', class_='row') or
-                soup.find_all('li')
-            )
-            
-            if transaction_elements:
-                transactions = self.parse_structured_elements(transaction_elements)
+            if texts:
+                transactions = self.parse_structured_texts(texts, scraped_at)
         except Exception as e:
             logger.warning(f"Structured parsing failed: {e}")
         
         # Method 2: Fallback to text pattern matching
         if not transactions:
-            transactions = self.parse_text_patterns(html_content)
+            transactions = self.parse_text_patterns(html_content, scraped_at)
         
         return transactions
     
-    def parse_structured_elements(self, elements) -> List[Dict]:
-        """Parse transactions from HTML elements"""
+    def parse_structured_texts(self, texts: List[str], scraped_at: Optional[str] = None) -> List[Dict]:
+        """Parse transactions from the text of HTML elements"""
         transactions = []
         
-        for element in elements:
-            text = element.get_text().strip()
+        for text in texts:
+            text = text.strip()
             if self.is_transaction_text(text):
-                parsed = self.parse_transaction_text(text)
+                parsed = self.parse_transaction_text(text, scraped_at)
                 if parsed:
                     transactions.append(parsed)
         
         return transactions
     
-    def parse_text_patterns(self, html_content: str) -> List[Dict]:
+    def parse_text_patterns(self, html_content: str, scraped_at: Optional[str] = None) -> List[Dict]:
         """
         Parse transactions using text pattern matching
         Based on the format you showed from Spotrac
         """
         transactions = []
-        lines = html_content.split('\n')
-        
-        current_player = None
-        current_position = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Pattern 1: Player Name (Position)
-            player_match = re.search(r'^([^(]+)\s*\(([^)]+)\)\s*$', line)
-            if player_match:
-                current_player = player_match.group(1).strip()
-                current_position = player_match.group(2).strip()
-                continue
-            
-            # Pattern 2: Date - Transaction details
-            if current_player and re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d+,\s+\d+\s*-', line):
-                parsed = self.parse_transaction_line(line, current_player, current_position)
-                if parsed:
-                    transactions.append(parsed)
-                current_player = None
-                current_position = None
+        
+        # One C-level scan over the raw text; no per-line split/strip copies
+        for player, position, line in TRANSACTION_BLOCK_RE.findall(html_content):
+            parsed = self.parse_transaction_line(line, player, position, scraped_at)
+            if parsed:
+                transactions.append(parsed)
         
         return transactions
     
     def is_transaction_text(self, text: str) -> bool:
         """Check if text contains transaction information"""
-        transaction_keywords = [
-            'signed', 'released', 'traded', 'waived', 'claimed', 
-            'contract', 'extension', 'suspended', 'retired'
-        ]
-        
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in transaction_keywords)
+        return TRANSACTION_KEYWORD_RE.search(text) is not None
     
-    def parse_transaction_text(self, text: str) -> Optional[Dict]:
+    def parse_transaction_text(self, text: str, scraped_at: Optional[str] = None) -> Optional[Dict]:
         """Parse a single transaction text"""
         try:
             # Extract player and position
-            player_match = re.search(r'^([^(]+)\s*\(([^)]+)\)', text)
+            player_match = PLAYER_PREFIX_RE.match(text)
             if not player_match:
                 return None
             
@@ -187,40 +577,32 @@ class SpotracNFLScraper:
             # Find the transaction line (everything after position)
             transaction_part = text[player_match.end():].strip()
             
-            return self.parse_transaction_line(transaction_part, player, position)
+            return self.parse_transaction_line(transaction_part, player, position, scraped_at)
             
         except Exception as e:
-            logger.warning(f"Error parsing transaction text: {e}")
+            logger.warning("Error parsing transaction text: %s", e)
             return None
     
-    def parse_transaction_line(self, line: str, player: str = None, position: str = None) -> Optional[Dict]:
+    def parse_transaction_line(self, line: str, player: str = None, position: str = None,
+                               scraped_at: Optional[str] = None) -> Optional[Dict]:
         """
         Parse transaction line like:
         "Jul 03, 2025 - Signed a 3 year contract extension through 2028 with Pittsburgh (PIT)"
         """
         try:
-            # Extract date
-            date_match = re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d+),\s+(\d+)', line)
+            # Extract date and transaction details (everything after the dash)
+            date_match = DATE_RE.search(line)
             if not date_match:
                 return None
             
-            month_str, day, year = date_match.groups()
-            month_num = {
-                'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-            }[month_str]
+            month_str, day, year, description = date_match.groups()
+            month_num = MONTH_NUMBERS[month_str]
             
             date_str = f"{year}-{month_num:02d}-{int(day):02d}"
-            
-            # Extract transaction details (everything after the dash)
-            dash_index = line.find(' - ')
-            if dash_index == -1:
-                return None
-            
-            description = line[dash_index + 3:].strip()
+            description = description.strip()
             
             # Extract team
-            team_match = re.search(r'with\s+([^(]+)\s*\(([^)]+)\)', description) or re.search(r'by\s+([^(]+)\s*\(([^)]+)\)', description)
+            team_match = TEAM_WITH_RE.search(description) or TEAM_BY_RE.search(description)
             team_full = team_match.group(1).strip() if team_match else "Unknown"
             team_abbr = team_match.group(2).strip() if team_match else "UNK"
             
@@ -230,8 +612,9 @@ class SpotracNFLScraper:
             # Determine transaction type
             transaction_type = self.classify_transaction(description)
             
-            # Generate unique ID
-            transaction_id = f"SPOTRAC_{date_str}_{player.replace(' ', '_')}_{hash(description) % 10000:04d}"
+            # Generate unique ID (hash() is salted per process, so use a stable digest)
+            description_hash = hashlib.blake2b(description.encode('utf-8'), digest_size=4).hexdigest()
+            transaction_id = f"SPOTRAC_{date_str}_{player.replace(' ', '_')}_{description_hash}"
             
             return {
                 'date': date_str,
@@ -241,85 +624,186 @@ class SpotracNFLScraper:
                 'position': position or "",
                 'description': description,
                 'transaction_id': transaction_id,
-                'scraped_at': datetime.now().isoformat(),
+                'scraped_at': scraped_at or datetime.now().isoformat(),
                 'source': 'Spotrac'
             }
             
         except Exception as e:
-            logger.warning(f"Error parsing transaction line: {e}")
+            logger.warning("Error parsing transaction line: %s", e)
             return None
     
     def classify_transaction(self, description: str) -> str:
         """Classify transaction type based on description"""
-        desc_lower = description.lower()
-        
-        if 'signed' in desc_lower and 'extension' in desc_lower:
-            return 'Contract Extension'
-        elif 'signed' in desc_lower:
-            return 'Signing'
-        elif 'traded' in desc_lower:
-            return 'Trade'
-        elif 'released' in desc_lower:
-            return 'Release'
-        elif 'waived' in desc_lower:
-            return 'Waiver'
-        elif 'claimed' in desc_lower:
-            return 'Waiver Claim'
-        elif 'suspended' in desc_lower:
-            return 'Suspension'
-        elif 'retired' in desc_lower:
-            return 'Retirement'
-        else:
-            return 'Other'
+        match = TRANSACTION_TYPE_RE.match(description)
+        return TRANSACTION_TYPE_BY_GROUP[match.lastgroup] if match else 'Other'
     
-    def get_daily_transactions(self, date: Optional[str] = None) -> pd.DataFrame:
+    def get_daily_transactions(self, date: Optional[str] = None,
+                               as_frame: bool = True) -> Union['pd.DataFrame', List[Dict]]:
         """
         Get transactions for a specific date or recent transactions
         
         Args:
             date: Date in YYYY-MM-DD format, defaults to recent transactions
+            as_frame: Return a processed DataFrame; pass False to get the raw
+                transaction dicts and merge several batches with
+                build_transactions_frame once at the end
             
         Returns:
-            DataFrame with processed transactions
+            DataFrame with processed transactions, or the raw list of dicts
         """
         logger.info("🚀 Starting Spotrac NFL transaction collection")
         
         try:
             # Fetch raw transaction data
-            raw_transactions = self.fetch_transactions(days_back=7)
+            raw_transactions = self.fetch_transactions(days_back=DAYS_BACK)
             
-            # Convert to DataFrame
-            if raw_transactions:
-                df = pd.DataFrame(raw_transactions)
-                
-                # Remove duplicates
-                df = df.drop_duplicates(subset=['transaction_id'], keep='first')
-                
-                # Sort by date (newest first)
-                df = df.sort_values('date', ascending=False)
-                
-                logger.info(f"🏆 Successfully processed {len(df)} unique transactions")
+            if not as_frame:
+                return raw_transactions
+            
+            return self.build_transactions_frame(raw_transactions)
+            
+        except Exception as e:
+            logger.error(f"❌ Error in transaction collection: {e}")
+            raise
+    
+    def get_transactions_between(self, start_date: str, end_date: str) -> 'pd.DataFrame':
+        """
+        Get transactions dated within a window from a single page fetch
+        
+        Args:
+            start_date: Start date in YYYY-MM-DD format (inclusive)
+            end_date: End date in YYYY-MM-DD format (inclusive)
+            
+        Returns:
+            DataFrame with processed transactions
+        """
+        logger.info(f"🚀 Collecting Spotrac NFL transactions from {start_date} to {end_date}")
+        
+        try:
+            df = self.build_transactions_frame(self.load_page_transactions())
+            if df.empty:
+                logger.info("📭 No transactions on the Spotrac page")
                 return df
-            else:
-                # Return empty DataFrame with correct columns
-                return pd.DataFrame(columns=[
-                    'date', 'type', 'team', 'player', 'position', 
-                    'description', 'transaction_id', 'scraped_at', 'source'
-                ])
+            
+            # Columnar window filter - ISO dates compare correctly as strings
+            df = df[df['date'].between(start_date, end_date)]
+            
+            logger.info(f"📅 {len(df)} transactions dated {start_date} to {end_date}")
+            return df
             
         except Exception as e:
             logger.error(f"❌ Error in transaction collection: {e}")
             raise
     
-    def save_to_csv(self, df: pd.DataFrame, filename: str = None) -> str:
-        """Save transactions to CSV file"""
+    def build_transactions_frame(self, raw_transactions: List[Dict]) -> 'pd.DataFrame':
+        """
+        Convert parsed transactions to a de-duplicated DataFrame
+        
+        Args:
+            raw_transactions: List of transaction dictionaries
+            
+        Returns:
+            DataFrame sorted newest first
+        """
+        # Remove duplicates before any rows are built
+        batch_ids = set()
+        unique_transactions = []
+        for transaction in raw_transactions:
+            transaction_id = transaction['transaction_id']
+            if transaction_id not in batch_ids:
+                batch_ids.add(transaction_id)
+                unique_transactions.append(transaction)
+        
+        import pandas as pd
+        
+        if unique_transactions:
+            # Known columns skip pandas' key discovery across every row dict
+            df = pd.DataFrame(unique_transactions, columns=TRANSACTION_COLUMNS)
+            
+            # Sort by date (newest first)
+            df = df.sort_values('date', ascending=False)
+            
+            logger.info(f"🏆 Successfully processed {len(df)} unique transactions")
+            return df
+        else:
+            # Return empty DataFrame with correct columns
+            return pd.DataFrame(columns=TRANSACTION_COLUMNS)
+    
+    def save_to_csv(self, df: 'pd.DataFrame', filename: str = None) -> Optional[str]:
+        """
+        Save transactions to CSV file
+        
+        Empty frames are not written, and a file whose content hash (kept in a
+        .hash sidecar) matches the frame is left untouched. The hash follows
+        row order and ignores scraped_at, which every run restamps.
+        
+        Args:
+            df: DataFrame with transaction data
+            filename: Optional output path, defaults to today's file
+            
+        Returns:
+            Path of the CSV file, or None if there was nothing to save
+        """
+        import pandas as pd
+        
+        if df.empty:
+            logger.info("📭 No transactions to save, skipping CSV")
+            return None
+        
         if not filename:
             filename = f"data/spotrac_nfl_transactions_{datetime.now().strftime('%Y-%m-%d')}.csv"
         
+        row_hashes = pd.util.hash_pandas_object(
+            df.drop(columns='scraped_at', errors='ignore'), index=False
+        )
+        digest = hashlib.sha1(row_hashes.values.tobytes()).hexdigest()
+        hash_file = f"{filename}.hash"
+        
+        try:
+            if os.path.exists(filename):
+                with open(hash_file, encoding='utf-8') as f:
+                    if f.read().strip() == digest:
+                        logger.info(f"⏭️ {filename} already up to date, skipping CSV write")
+                        return filename
+        except OSError:
+            pass
+        
         os.makedirs(os.path.dirname(filename), exist_ok=True)
         df.to_csv(filename, index=False)
+        with open(hash_file, 'w', encoding='utf-8') as f:
+            f.write(digest)
+        
         logger.info(f"💾 Saved {len(df)} transactions to {filename}")
         return filename
+    
+    def save_to_parquet(self, df: 'pd.DataFrame', filename: str = None) -> Optional[str]:
+        """
+        Archive transactions to a zstd-compressed Parquet file
+        
+        Args:
+            df: DataFrame with transaction data
+            filename: Optional output path, defaults to today's archive file
+            
+        Returns:
+            Path written, or None if no Parquet engine is installed
+        """
+        if not filename:
+            filename = f"data/spotrac_nfl_transactions_{datetime.now().strftime('%Y-%m-%d')}.parquet"
+        
+        # Repeated team/type strings are stored once as dictionary-encoded categoricals
+        archive_df = df.astype({
+            column: 'category' for column in ('type', 'team', 'source') if column in df.columns
+        })
+        
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        try:
+            archive_df.to_parquet(filename, engine='pyarrow', compression='zstd', index=False)
+        except ImportError as e:
+            logger.warning(f"⚠️ Skipping Parquet archive (pyarrow not installed): {e}")
+            return None
+        
+        logger.info(f"🗄️ Archived {len(df)} transactions to {filename}")
+        return filename
 
 
 # Alias for compatibility with existing code
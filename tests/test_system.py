@@ -8,9 +8,11 @@ import sys
 import unittest
 import tempfile
 import json
+from importlib.util import find_spec
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 import pandas as pd
+from bs4 import BeautifulSoup
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -248,6 +250,93 @@ class TestNFLTransactionSystem(unittest.TestCase):
                     raise
         
         print("✅ System integration test passed")
+    
+    def test_historical_backfill_single_write(self):
+        """Test that backfill writes the whole window in one Sheets update"""
+        print("🧪 Testing historical backfill batching...")
+        
+        automation = NFLTransactionAutomation.__new__(NFLTransactionAutomation)
+        automation.scraper = MagicMock()
+        automation.sheets_updater = MagicMock()
+        automation.scraper.get_transactions_between.return_value = pd.DataFrame([
+            {'date': '2024-01-15', 'type': 'Signing', 'team': 'Philadelphia Eagles',
+             'player': 'Test Player', 'transaction_id': 'test_001'}
+        ])
+        automation.scraper.filter_unseen.side_effect = lambda df: df
+        automation.sheets_updater.process_daily_update.return_value = {
+            'new_transactions': 1, 'duplicate_transactions': 0
+        }
+        
+        result = automation.run_historical_backfill('2024-01-15', '2024-01-17')
+        
+        automation.scraper.get_transactions_between.assert_called_once_with('2024-01-15', '2024-01-17')
+        automation.sheets_updater.process_daily_update.assert_called_once()
+        automation.scraper.save_to_csv.assert_called_once()
+        self.assertEqual(result['transactions_found'], 1)
+        
+        print("✅ Historical backfill batching test passed")
+    
+    def test_publish_marks_seen_after_sheets(self):
+        """Test that the CSV keeps every row and only Sheets writes mark IDs seen"""
+        print("🧪 Testing publish seen-ID handling...")
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        df = pd.DataFrame([
+            {'date': today, 'type': 'Signing', 'team': 'Philadelphia Eagles',
+             'player': 'Test Player', 'transaction_id': 'test_001'},
+            {'date': today, 'type': 'Release', 'team': 'Dallas Cowboys',
+             'player': 'Another Player', 'transaction_id': 'test_002'}
+        ])
+        
+        automation = NFLTransactionAutomation.__new__(NFLTransactionAutomation)
+        automation.scraper = NFLTransactionScraper()
+        automation.scraper.seen_ids = {'test_001': today}
+        automation.sheets_updater = None
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_file = os.path.join(temp_dir, 'day.csv')
+            
+            # CSV-only run: full frame written, nothing marked seen
+            automation.publish_transactions(df, {'date_processed': '2024-01-15', 'transactions_found': 2,
+                                                 'csv_file': None, 'success': True}, csv_file)
+            self.assertEqual(len(pd.read_csv(csv_file)), 2)
+            self.assertEqual(automation.scraper.seen_ids, {'test_001': today})
+            
+            # Sheets run: only the unseen row is sent, then marked seen
+            automation.sheets_updater = MagicMock()
+            automation.sheets_updater.process_daily_update.return_value = {
+                'new_transactions': 1, 'duplicate_transactions': 0
+            }
+            results = {'date_processed': '2024-01-15', 'transactions_found': 2,
+                       'csv_file': None, 'success': True}
+            automation.publish_transactions(df, results, csv_file)
+        
+        sent = automation.sheets_updater.process_daily_update.call_args[0][0]
+        self.assertEqual(sent['transaction_id'].tolist(), ['test_002'])
+        self.assertEqual(results['duplicate_transactions'], 1)
+        self.assertEqual(automation.scraper.seen_ids, {'test_001': today, 'test_002': today})
+        
+        print("✅ Publish seen-ID handling test passed")
+    
+    def test_connectivity_probe_reused(self):
+        """Test that repeated connectivity tests reuse recent probe results"""
+        print("🧪 Testing connectivity probe TTL...")
+        
+        automation = NFLTransactionAutomation.__new__(NFLTransactionAutomation)
+        automation.scraper = MagicMock()
+        automation.sheets_updater = MagicMock()
+        automation._sheets_probed_at = None
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            automation.scraper.save_to_csv.return_value = os.path.join(temp_dir, 'probe.csv')
+            first = automation.test_system_connectivity()
+            second = automation.test_system_connectivity()
+        
+        self.assertTrue(first['google_sheets'] and second['google_sheets'])
+        automation.sheets_updater.setup_worksheet.assert_called_once()
+        automation.scraper.load_page_transactions.assert_called_with(max_age=60)
+        
+        print("✅ Connectivity probe TTL test passed")
 
 
 class TestDataQuality(unittest.TestCase):
@@ -302,6 +391,542 @@ class TestDataQuality(unittest.TestCase):
         print("✅ Data types test passed")
 
 
+class TestTransactionScraper(unittest.TestCase):
+    """Test Spotrac scraper behavior without network access"""
+
+    def setUp(self):
+        """Set up a sample parsed transaction and an isolated page cache"""
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache_patch = patch('transaction_scraper.CACHE_DIR', cache_dir.name)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        self.transactions = [{
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'type': 'Signing',
+            'team': 'Pittsburgh Steelers',
+            'player': 'Test Player',
+            'position': 'WR',
+            'description': 'Signed a 1 year contract with Pittsburgh (PIT)',
+            'transaction_id': 'SPOTRAC_test_0001',
+            'scraped_at': datetime.now().isoformat(),
+            'source': 'Spotrac'
+        }]
+
+    def test_session_shared(self):
+        """Test that scrapers share one pooled HTTP session"""
+        print("🧪 Testing shared HTTP session...")
+
+        first, second = NFLTransactionScraper(), NFLTransactionScraper()
+
+        self.assertIs(first.session, second.session)
+        self.assertEqual(first.session.get_adapter(first.base_url)._pool_maxsize, 16)
+
+        print("✅ Shared HTTP session test passed")
+
+    def test_page_cache_reused(self):
+        """Test that a cached page fetch is reused across scraper instances"""
+        print("🧪 Testing page cache...")
+
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch('transaction_scraper.CACHE_DIR', temp_dir), \
+                patch.object(NFLTransactionScraper, 'fetch_page_transactions',
+                             return_value=self.transactions) as mock_fetch:
+            first = NFLTransactionScraper(cache_max_age=60).fetch_transactions()
+            second = NFLTransactionScraper(cache_max_age=60).fetch_transactions()
+
+            self.assertEqual(first, second)
+            mock_fetch.assert_called_once()
+
+            # max_age 0 always asks Spotrac, conditionally on the cached entry
+            NFLTransactionScraper().fetch_transactions()
+            self.assertEqual(mock_fetch.call_count, 2)
+            self.assertEqual(mock_fetch.call_args.args[0]['transactions'], self.transactions)
+
+        print("✅ Page cache test passed")
+
+    def test_expired_cache_revalidated(self):
+        """Test that an expired cache entry is revalidated with a conditional GET"""
+        print("🧪 Testing conditional page revalidation...")
+
+        page = MagicMock(status_code=200, headers={'ETag': '"v1"'}, content=b'', text='')
+        unchanged = MagicMock(status_code=304, headers={})
+        parsed = [dict(self.transactions[0], scraped_at='2000-01-01T00:00:00')]
+
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch('transaction_scraper.CACHE_DIR', temp_dir):
+            scraper = NFLTransactionScraper(cache_max_age=60)
+
+            with patch.object(scraper.session, 'get', return_value=page), \
+                    patch.object(scraper, 'parse_page_content', return_value=parsed):
+                scraper.load_page_transactions()
+
+            # Age the cache entry past max_age
+            cache_file = os.path.join(temp_dir, os.listdir(temp_dir)[0])
+            os.utime(cache_file, (0, 0))
+
+            with patch.object(scraper.session, 'get', return_value=unchanged) as mock_get, \
+                    patch.object(scraper, 'parse_page_content') as mock_parse:
+                transactions = scraper.load_page_transactions()
+
+            # Same rows, restamped with the revalidated fetch's scrape time
+            self.assertEqual(
+                [dict(t, scraped_at=None) for t in transactions],
+                [dict(t, scraped_at=None) for t in parsed]
+            )
+            self.assertNotEqual(transactions[0]['scraped_at'], '2000-01-01T00:00:00')
+            self.assertEqual(mock_get.call_args.kwargs['headers']['If-None-Match'], '"v1"')
+            mock_parse.assert_not_called()
+
+        print("✅ Conditional page revalidation test passed")
+
+    def test_transactions_between(self):
+        """Test that a date window is sliced from one page fetch"""
+        print("🧪 Testing date window collection...")
+
+        page = [
+            dict(self.transactions[0], date=date, transaction_id=f"SPOTRAC_{date}")
+            for date in ['2024-01-14', '2024-01-15', '2024-01-16', '2024-01-18']
+        ]
+
+        scraper = NFLTransactionScraper()
+        with patch.object(scraper, 'fetch_page_transactions', return_value=page) as mock_fetch:
+            df = scraper.get_transactions_between('2024-01-15', '2024-01-17')
+
+        mock_fetch.assert_called_once()
+        self.assertEqual(df['date'].tolist(), ['2024-01-16', '2024-01-15'])
+
+        print("✅ Date window collection test passed")
+
+    def test_daily_transactions_raw(self):
+        """Test that as_frame=False returns raw dicts for a single final merge"""
+        print("🧪 Testing raw daily transactions...")
+
+        scraper = NFLTransactionScraper()
+        with patch.object(scraper, 'fetch_page_transactions', return_value=self.transactions):
+            raw = scraper.get_daily_transactions(as_frame=False)
+            df = scraper.build_transactions_frame(raw + raw)
+
+        self.assertEqual(raw, self.transactions)
+        self.assertEqual(len(df), 1)
+
+        print("✅ Raw daily transactions test passed")
+
+    def test_fetch_filters_old_transactions(self):
+        """Test that the days_back cutoff drops old dates and keeps unparseable ones"""
+        print("🧪 Testing transaction date cutoff...")
+
+        today = datetime.now().strftime('%Y-%m-%d')
+        transactions = [
+            dict(self.transactions[0], date=date, transaction_id=f"SPOTRAC_{index}")
+            for index, date in enumerate([today, '2000-01-01', '2025-02-30'])
+        ]
+
+        scraper = NFLTransactionScraper()
+        with patch.object(scraper, 'load_page_transactions', return_value=transactions):
+            recent = scraper.fetch_transactions(days_back=7)
+
+        self.assertEqual([t['date'] for t in recent], [today, '2025-02-30'])
+
+        print("✅ Transaction date cutoff test passed")
+
+    def test_seen_ids_skipped_across_runs(self):
+        """Test that IDs written to Sheets are filtered for Sheets only on later runs"""
+        print("🧪 Testing seen transaction IDs...")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            seen_ids_file = os.path.join(temp_dir, 'seen_ids.json')
+
+            first_run = NFLTransactionScraper(seen_ids_file=seen_ids_file)
+            df = first_run.build_transactions_frame(self.transactions)
+            self.assertEqual(len(first_run.filter_unseen(df)), 1)
+            first_run.mark_seen({
+                self.transactions[0]['transaction_id']: self.transactions[0]['date']
+            })
+
+            second_run = NFLTransactionScraper(seen_ids_file=seen_ids_file)
+            df = second_run.build_transactions_frame(self.transactions)
+            self.assertEqual(len(df), 1)  # CSV still gets the full day
+            self.assertTrue(second_run.filter_unseen(df).empty)
+
+            # IDs dated before the scrape window are not kept
+            second_run.mark_seen({'SPOTRAC_old': '2000-01-01'})
+            third_run = NFLTransactionScraper(seen_ids_file=seen_ids_file)
+            self.assertEqual(list(third_run.seen_ids), [self.transactions[0]['transaction_id']])
+
+        print("✅ Seen transaction IDs test passed")
+
+    def test_page_shares_scraped_at(self):
+        """Test that every transaction on a page gets the same scrape timestamp"""
+        print("🧪 Testing page scrape timestamp...")
+
+        html = (
+            "<ul>"
+            "<li>John Doe (WR) Jul 03, 2025 - Signed a 3 year contract with Pittsburgh (PIT)</li>"
+            "<li>Jane Roe (QB) Jul 04, 2025 - Released by Dallas (DAL)</li>"
+            "</ul>"
+        )
+
+        scraper = NFLTransactionScraper()
+        transactions = scraper.parse_spotrac_page(BeautifulSoup(html, 'html.parser'), html)
+
+        self.assertEqual(len(transactions), 2)
+        self.assertEqual(len({t['scraped_at'] for t in transactions}), 1)
+
+        print("✅ Page scrape timestamp test passed")
+
+    def test_page_content_parsing(self):
+        """Test parsing raw page bytes (lxml XPath when installed, else BeautifulSoup)"""
+        print("🧪 Testing page content parsing...")
+
+        html = (
+            "<html><body><ul>"
+            "<li>John Doe (WR) Jul 03, 2025 - Signed a 3 year contract with Pittsburgh (PIT)</li>"
+            "<li>Jane Roe (QB) Jul 04, 2025 - Released by Dallas (DAL)</li>"
+            "</ul></body></html>"
+        )
+
+        scraper = NFLTransactionScraper()
+        transactions = scraper.parse_page_content(html.encode('utf-8'), html)
+
+        self.assertEqual([t['player'] for t in transactions], ['John Doe', 'Jane Roe'])
+        self.assertEqual([t['team'] for t in transactions], ['Pittsburgh Steelers', 'Dallas Cowboys'])
+
+        print("✅ Page content parsing test passed")
+
+    def test_container_kind_priority(self):
+        """Test that only the most specific container kind on a page is parsed"""
+        print("🧪 Testing container kind priority...")
+
+        html = (
+            "<html><body>"
+            "<div class='col row'>John Doe (WR) Jul 03, 2025 - Signed a 3 year contract with Pittsburgh (PIT)</div>"
+            "<ul><li>Jane Roe (QB) Jul 04, 2025 - Released by Dallas (DAL)</li></ul>"
+            "</body></html>"
+        )
+
+        scraper = NFLTransactionScraper()
+        from_soup = scraper.parse_spotrac_page(BeautifulSoup(html, 'html.parser'), html)
+        from_content = scraper.parse_page_content(html.encode('utf-8'), html)
+
+        self.assertEqual([t['player'] for t in from_soup], ['John Doe'])
+        self.assertEqual([t['player'] for t in from_content], ['John Doe'])
+
+        print("✅ Container kind priority test passed")
+
+    def test_structured_rows_beside_text_blurb(self):
+        """Test that a stray "Name (POS)" blurb does not hide structured rows"""
+        print("🧪 Testing structured rows beside a text blurb...")
+
+        html = (
+            "<html><body>"
+            "<p>Featured: Joe Star (QB)\nJul 01, 2025 - Signed with Dallas (DAL)</p>"
+            "<table>"
+            "<tr><td>John Doe (WR) Jul 03, 2025 - Signed a 3 year contract with Pittsburgh (PIT)</td></tr>"
+            "<tr><td>Jane Roe (QB) Jul 04, 2025 - Released by Dallas (DAL)</td></tr>"
+            "</table></body></html>"
+        )
+
+        transactions = NFLTransactionScraper().parse_page_content(html.encode('utf-8'), html)
+
+        self.assertEqual([t['player'] for t in transactions], ['John Doe', 'Jane Roe'])
+
+        print("✅ Structured rows beside a text blurb test passed")
+
+    def test_text_pattern_parsing(self):
+        """Test the plain-text fallback pairs each player line with its date line"""
+        print("🧪 Testing text pattern parsing...")
+
+        text = (
+            "Spotrac Transactions\n"
+            "  John Doe (WR)\n"
+            "Jul 03, 2025 - Signed a 3 year contract with Pittsburgh (PIT)\n"
+            "\n"
+            "Jane Roe (QB)\n"
+            "\n"
+            "Jul 04, 2025 - Released by Dallas (DAL)\n"
+        )
+
+        scraper = NFLTransactionScraper()
+        transactions = scraper.parse_text_patterns(text)
+
+        self.assertEqual([t['player'] for t in transactions], ['John Doe', 'Jane Roe'])
+        self.assertEqual([t['date'] for t in transactions], ['2025-07-03', '2025-07-04'])
+        self.assertEqual(transactions[1]['description'], 'Released by Dallas (DAL)')
+
+        # Other lines between a player and its date line are skipped, but a
+        # later player line takes the date line over
+        text = (
+            "John Doe (WR)\n"
+            "Signed via agent\n"
+            "Jul 03, 2025 - Signed a 3 year contract with Pittsburgh (PIT)\n"
+            "Old Name (QB)\n"
+            "no date here\n"
+            "Jane Roe (QB)\n"
+            "Jul 04, 2025 - Released by Dallas (DAL)\n"
+        )
+
+        transactions = scraper.parse_text_patterns(text)
+
+        self.assertEqual([t['player'] for t in transactions], ['John Doe', 'Jane Roe'])
+
+        print("✅ Text pattern parsing test passed")
+
+    def test_transaction_id_stable(self):
+        """Test that transaction IDs do not depend on the per-process hash seed"""
+        print("🧪 Testing stable transaction IDs...")
+
+        scraper = NFLTransactionScraper()
+        parsed = scraper.parse_transaction_line(
+            "Jul 03, 2025 - Signed a 3 year contract with Pittsburgh (PIT)", "John Doe", "WR"
+        )
+
+        self.assertEqual(parsed['transaction_id'], 'SPOTRAC_2025-07-03_John_Doe_802d3baa')
+
+        print("✅ Stable transaction ID test passed")
+
+    def test_transaction_line_text_before_dash(self):
+        """Test that details start at the first " - " after the date, as before"""
+        print("🧪 Testing transaction line with text before the dash...")
+
+        scraper = NFLTransactionScraper()
+        parsed = scraper.parse_transaction_line(
+            "Jul 03, 2025 (Transaction) - Signed a 3 year contract with Pittsburgh (PIT)",
+            "John Doe", "WR"
+        )
+
+        self.assertEqual(parsed['date'], '2025-07-03')
+        self.assertEqual(parsed['description'], 'Signed a 3 year contract with Pittsburgh (PIT)')
+        self.assertEqual(parsed['team'], 'Pittsburgh Steelers')
+
+        print("✅ Transaction line with text before the dash test passed")
+
+    def test_classify_transaction_priority(self):
+        """Test that classification keeps the rule priority, not keyword position"""
+        print("🧪 Testing transaction classification...")
+
+        scraper = NFLTransactionScraper()
+        cases = {
+            'Signed a 3 year contract extension through 2028': 'Contract Extension',
+            'EXTENSION signed with Pittsburgh (PIT)': 'Contract Extension',
+            'Released after he signed with Dallas (DAL)': 'Signing',
+            'Claimed off waivers, later traded': 'Trade',
+            'Placed on reserve/retired list': 'Retirement',
+            'Activated from injured reserve': 'Other',
+        }
+
+        for description, expected in cases.items():
+            self.assertEqual(scraper.classify_transaction(description), expected, description)
+
+        print("✅ Transaction classification test passed")
+
+    def test_parquet_archive(self):
+        """Test that the Parquet archive round-trips, or is skipped without pyarrow"""
+        print("🧪 Testing Parquet archive...")
+
+        scraper = NFLTransactionScraper()
+        df = pd.DataFrame(self.transactions)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = scraper.save_to_parquet(df, os.path.join(temp_dir, 'archive.parquet'))
+
+            if find_spec('pyarrow') is None:
+                self.assertIsNone(filename)
+            else:
+                archived = pd.read_parquet(filename)
+                self.assertEqual(archived['transaction_id'].tolist(), df['transaction_id'].tolist())
+                self.assertEqual(archived['team'].dtype, 'category')
+
+        print("✅ Parquet archive test passed")
+
+    def test_csv_save_idempotent(self):
+        """Test that empty frames and unchanged content are not rewritten"""
+        print("🧪 Testing idempotent CSV save...")
+
+        scraper = NFLTransactionScraper()
+        df = pd.DataFrame(self.transactions)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'transactions.csv')
+
+            self.assertIsNone(scraper.save_to_csv(df.iloc[0:0], filename))
+            self.assertFalse(os.path.exists(filename))
+
+            self.assertEqual(scraper.save_to_csv(df, filename), filename)
+            with patch.object(pd.DataFrame, 'to_csv') as mock_to_csv:
+                self.assertEqual(scraper.save_to_csv(df, filename), filename)
+                mock_to_csv.assert_not_called()
+
+            # A later run restamps scraped_at but scrapes the same rows
+            rerun = df.assign(scraped_at='2099-01-01T00:00:00')
+            with patch.object(pd.DataFrame, 'to_csv') as mock_to_csv:
+                scraper.save_to_csv(rerun, filename)
+                mock_to_csv.assert_not_called()
+
+            # Same rows in a different order are a change
+            two_rows = pd.concat([df, df.assign(transaction_id='SPOTRAC_test_0002')])
+            scraper.save_to_csv(two_rows, filename)
+            with patch.object(pd.DataFrame, 'to_csv') as mock_to_csv:
+                scraper.save_to_csv(two_rows.iloc[::-1], filename)
+                mock_to_csv.assert_called_once()
+
+        print("✅ Idempotent CSV save test passed")
+
+
+class TestGoogleSheetsUpdater(unittest.TestCase):
+    """Test Google Sheets write paths against a mocked worksheet"""
+
+    def setUp(self):
+        """Build an updater without connecting to Google"""
+        self.updater = GoogleSheetsUpdater.__new__(GoogleSheetsUpdater)
+        self.updater.worksheet = MagicMock()
+        self.updater._existing_ids = None
+        self.updater._sheet_ids = None
+        self.updater._metadata_has_table = None
+        self.rows = [
+            {
+                'date': '2024-01-15',
+                'type': 'Signing',
+                'team': 'Philadelphia Eagles',
+                'player': 'Test Player',
+                'position': 'WR',
+                'description': 'Signed a 1 year contract',
+                'transaction_id': 'test_001',
+                'scraped_at': '2024-01-15T14:30:00'
+            },
+            {
+                'date': '2024-01-15',
+                'type': 'Release',
+                'team': 'Dallas Cowboys',
+                'player': None,
+                'position': 'LB',
+                'description': 'Released',
+                'transaction_id': 'test_002',
+                'scraped_at': '2024-01-15T14:30:00'
+            }
+        ]
+
+    def _mock_spreadsheet(self, metadata_header='Field'):
+        """Attach a mocked spreadsheet holding test_001 and a Metadata worksheet"""
+        self.updater.sheet = MagicMock()
+        self.updater.worksheet = None
+        self.updater._sheet_ids = None
+        self.updater.sheet.worksheet.return_value.id = 0
+        self.updater.sheet.worksheet.return_value.title = 'NFL_Transactions'
+        metadata_range = {'values': [[metadata_header]]} if metadata_header else {}
+        self.updater.sheet.values_batch_get.return_value = {
+            'valueRanges': [{'values': [['test_001']]}, metadata_range]
+        }
+        self.updater.sheet.fetch_sheet_metadata.return_value = {
+            'sheets': [
+                {'properties': {'title': 'NFL_Transactions', 'sheetId': 0}},
+                {'properties': {'title': 'Metadata', 'sheetId': 7}}
+            ]
+        }
+
+    def test_metadata_failure_keeps_append(self):
+        """Test that a failing Metadata lookup or write never drops the row append"""
+        print("🧪 Testing best-effort metadata...")
+
+        self._mock_spreadsheet()
+        self.updater.sheet.fetch_sheet_metadata.side_effect = Exception("quota exceeded")
+
+        result = self.updater.process_daily_update(self.rows)
+
+        self.assertEqual(result['new_transactions'], 1)
+        requests = self.updater.sheet.batch_update.call_args[0][0]['requests']
+        self.assertEqual([list(request) for request in requests], [['appendCells']])
+
+        # A batch rejected because of its metadata part is resent without it
+        self._mock_spreadsheet()
+        self.updater.sheet.batch_update.side_effect = [Exception("bad sheetId"), {}]
+
+        result = self.updater.process_daily_update(self.rows)
+
+        self.assertEqual(result['new_transactions'], 1)
+        self.assertEqual(self.updater.sheet.batch_update.call_count, 2)
+        requests = self.updater.sheet.batch_update.call_args[0][0]['requests']
+        self.assertEqual([list(request) for request in requests], [['appendCells']])
+
+        print("✅ Best-effort metadata test passed")
+
+    def test_existing_ids_cached(self):
+        """Test that existing IDs are fetched once and updated after appends"""
+        print("🧪 Testing existing ID cache...")
+
+        self.updater.sheet = MagicMock()
+        self.updater.sheet.values_batch_get.return_value = {
+            'valueRanges': [{'values': [['test_001']]}]
+        }
+
+        new_rows = self.updater.filter_new_transactions(self.rows)
+        self.assertEqual([row['transaction_id'] for row in new_rows], ['test_002'])
+
+        self.updater.setup_worksheet = MagicMock()
+        self.updater.process_daily_update(new_rows)
+        self.assertEqual(self.updater.filter_new_transactions(self.rows), [])
+        self.updater.sheet.values_batch_get.assert_called_once()
+
+        print("✅ Existing ID cache test passed")
+
+    def test_process_daily_update_single_batch(self):
+        """Test that appends and metadata go out in one batchUpdate request"""
+        print("🧪 Testing single batchUpdate...")
+
+        self._mock_spreadsheet()
+
+        result = self.updater.process_daily_update(pd.DataFrame(self.rows))
+
+        self.assertEqual(result['new_transactions'], 1)
+        self.assertEqual(result['duplicate_transactions'], 1)
+        self.updater.sheet.batch_update.assert_called_once()
+        requests = self.updater.sheet.batch_update.call_args[0][0]['requests']
+        self.assertEqual(len(requests[0]['appendCells']['rows']), 1)
+        # Missing player is written as a blank cell, not "None"
+        cells = requests[0]['appendCells']['rows'][0]['values']
+        self.assertNotIn('None', [cell['userEnteredValue']['stringValue'] for cell in cells])
+        self.assertEqual(requests[1]['updateCells']['start']['sheetId'], 7)
+        # Existing Metadata sheet only gets its timestamp cell (B2) refreshed
+        self.assertEqual(requests[1]['updateCells']['start']['rowIndex'], 1)
+        self.assertEqual(len(requests[1]['updateCells']['rows']), 1)
+
+        print("✅ Single batchUpdate test passed")
+
+    def test_metadata_table_restored_when_missing(self):
+        """Test that the Field/Value table is rewritten whenever Metadata!A1 is not 'Field'"""
+        print("🧪 Testing metadata table check...")
+
+        # Existing but hand-cleared Metadata sheet
+        self._mock_spreadsheet(metadata_header=None)
+        self.updater.process_daily_update(self.rows)
+
+        ranges = self.updater.sheet.values_batch_get.call_args.kwargs['ranges']
+        self.assertEqual(len(ranges), 2)  # A1 read alongside the ID column
+        requests = self.updater.sheet.batch_update.call_args[0][0]['requests']
+        self.assertEqual(requests[-1]['updateCells']['start']['rowIndex'], 0)
+        self.assertEqual(len(requests[-1]['updateCells']['rows']), 5)
+
+        # Sheet created, then the combined batch fails: the next run must
+        # still write the table rather than only B2
+        self.updater._metadata_has_table = None
+        self._mock_spreadsheet()
+        self.updater.sheet.fetch_sheet_metadata.return_value = {
+            'sheets': [{'properties': {'title': 'NFL_Transactions', 'sheetId': 0}}]
+        }
+        self.updater.sheet.add_worksheet.return_value.id = 7
+        self.updater.sheet.batch_update.side_effect = [Exception("bad sheetId"), {}]
+        self.updater.process_daily_update(self.rows)
+
+        self._mock_spreadsheet(metadata_header=None)
+        self.updater.process_daily_update(self.rows)
+
+        requests = self.updater.sheet.batch_update.call_args[0][0]['requests']
+        self.assertEqual(len(requests[-1]['updateCells']['rows']), 5)
+
+        print("✅ Metadata table check test passed")
+
+
 def run_connectivity_tests():
     """Run real connectivity tests (requires actual credentials)"""
     print("\n🌐 CONNECTIVITY TESTS")
@@ -359,6 +984,8 @@ def main():
     # Add test classes
     suite.addTests(loader.loadTestsFromTestCase(TestNFLTransactionSystem))
     suite.addTests(loader.loadTestsFromTestCase(TestDataQuality))
+    suite.addTests(loader.loadTestsFromTestCase(TestTransactionScraper))
+    suite.addTests(loader.loadTestsFromTestCase(TestGoogleSheetsUpdater))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)